@@ -0,0 +1,124 @@
+from typing import Dict
+from collections import deque
+from contextlib import asynccontextmanager
+import asyncio
+import time
+
+class AdmissionRejected(Exception):
+    """Raised when a request is shed instead of admitted"""
+
+    def __init__(self, status_code: int, detail: str, retry_after: int):
+        super().__init__(detail)
+        self.status_code = status_code
+        self.detail = detail
+        self.retry_after = retry_after
+
+class AdmissionController:
+    """Bounds concurrent model work and sheds load once per-endpoint queues fill up.
+
+    A shared pool of slots is handed to waiting requests in priority order
+    (lower number first), so interactive questions overtake bulk uploads.
+    """
+
+    def __init__(self, max_concurrent: int, queue_limits: Dict[str, int],
+                 priorities: Dict[str, int], queue_timeout: float, retry_after: int):
+        self.max_concurrent = max_concurrent
+        self.queue_limits = queue_limits
+        self.queue_timeout = queue_timeout
+        self.retry_after = retry_after
+        self.endpoints = sorted(queue_limits, key=lambda name: priorities[name])
+        self.priorities = priorities
+        self.queues = {name: deque() for name in self.endpoints}
+        self.active = 0
+        self.stats = {
+            name: {"admitted": 0, "rejected": 0, "timed_out": 0, "total_wait": 0.0, "max_wait": 0.0}
+            for name in self.endpoints
+        }
+
+    def _has_waiters_ahead(self, endpoint: str) -> bool:
+        """Check for queued requests of equal or higher priority"""
+        return any(
+            self.queues[name]
+            for name in self.endpoints
+            if self.priorities[name] <= self.priorities[endpoint]
+        )
+
+    def _reject(self, status_code: int, detail: str):
+        raise AdmissionRejected(status_code, detail, self.retry_after)
+
+    async def _acquire(self, endpoint: str) -> float:
+        """Wait for a slot and return the time spent queued in seconds"""
+        if self.active < self.max_concurrent and not self._has_waiters_ahead(endpoint):
+            self.active += 1
+            return 0.0
+
+        queue = self.queues[endpoint]
+        if len(queue) >= self.queue_limits[endpoint]:
+            self.stats[endpoint]["rejected"] += 1
+            self._reject(429, "Server is busy, please retry later")
+
+        waiter = asyncio.get_running_loop().create_future()
+        queue.append(waiter)
+        start = time.perf_counter()
+
+        try:
+            await asyncio.wait({waiter}, timeout=self.queue_timeout)
+        except asyncio.CancelledError:
+            # Client went away; give back a slot that was already handed over
+            if waiter.done() and not waiter.cancelled():
+                self._release()
+            else:
+                queue.remove(waiter)
+                waiter.cancel()
+            raise
+
+        if not waiter.done():
+            queue.remove(waiter)
+            waiter.cancel()
+            self.stats[endpoint]["timed_out"] += 1
+            self._reject(503, "Request timed out waiting in queue")
+
+        return time.perf_counter() - start
+
+    def _release(self):
+        """Hand the slot to the highest-priority waiter, or free it"""
+        for name in self.endpoints:
+            queue = self.queues[name]
+            while queue:
+                waiter = queue.popleft()
+                if not waiter.done():
+                    waiter.set_result(None)
+                    return
+        self.active -= 1
+
+    @asynccontextmanager
+    async def admit(self, endpoint: str):
+        """Hold a slot for the duration of the block, yielding the queue wait"""
+        wait = await self._acquire(endpoint)
+        stats = self.stats[endpoint]
+        stats["admitted"] += 1
+        stats["total_wait"] += wait
+        stats["max_wait"] = max(stats["max_wait"], wait)
+        try:
+            yield wait
+        finally:
+            self._release()
+
+    def snapshot(self) -> Dict:
+        """Current queue depths and wait statistics"""
+        return {
+            "active": self.active,
+            "max_concurrent": self.max_concurrent,
+            "queues": {
+                name: {
+                    "queued": len(self.queues[name]),
+                    "limit": self.queue_limits[name],
+                    "admitted": stats["admitted"],
+                    "rejected": stats["rejected"],
+                    "timed_out": stats["timed_out"],
+                    "avg_wait_ms": round(stats["total_wait"] / stats["admitted"] * 1000, 1) if stats["admitted"] else 0.0,
+                    "max_wait_ms": round(stats["max_wait"] * 1000, 1),
+                }
+                for name, stats in self.stats.items()
+            }
+        }
@@ -9,6 +9,12 @@ class Config:
     QDRANT_HOST = os.getenv("QDRANT_HOST", "localhost")
     QDRANT_PORT = int(os.getenv("QDRANT_PORT", 6333))
     QDRANT_COLLECTION_NAME = os.getenv("QDRANT_COLLECTION_NAME", "documents")
+    # Comma-separated collections clients may route uploads and questions to
+    QDRANT_COLLECTIONS = [
+        name.strip()
+        for name in os.getenv("QDRANT_COLLECTIONS", QDRANT_COLLECTION_NAME).split(",")
+        if name.strip()
+    ]
     
     # Model settings
     INSTRUCTOR_MODEL = os.getenv("INSTRUCTOR_MODEL", "hkunlp/instructor-xl")
@@ -23,6 +29,13 @@ class Config:
     API_HOST = os.getenv("API_HOST", "0.0.0.0")
     API_PORT = int(os.getenv("API_PORT", 8000))
     
+    # Admission control settings
+    MAX_CONCURRENT_REQUESTS = int(os.getenv("MAX_CONCURRENT_REQUESTS", 1))
+    ASK_QUEUE_SIZE = int(os.getenv("ASK_QUEUE_SIZE", 16))
+    UPLOAD_QUEUE_SIZE = int(os.getenv("UPLOAD_QUEUE_SIZE", 4))
+    QUEUE_TIMEOUT_SECONDS = float(os.getenv("QUEUE_TIMEOUT_SECONDS", 30))
+    RETRY_AFTER_SECONDS = int(os.getenv("RETRY_AFTER_SECONDS", 5))
+    
     # RAG settings
     TOP_K_RESULTS = 5
     MAX_CONTEXT_LENGTH = 2000
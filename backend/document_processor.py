@@ -4,6 +4,7 @@ from typing import List, Dict
 import re
 from pathlib import Path
 import tempfile
+import asyncio
 import os
 
 class DocumentProcessor:
@@ -116,7 +117,12 @@ class DocumentProcessor:
             raise Exception(f"Error processing file {filename}: {str(e)}")
     
     async def process_uploaded_file(self, file_content: bytes, filename: str) -> List[Dict]:
-        """Process uploaded file content"""
+        """Process uploaded file content in a worker thread so parsing doesn't block the event loop"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self.process_file_content, file_content, filename)
+    
+    def process_file_content(self, file_content: bytes, filename: str) -> List[Dict]:
+        """Process raw file content via a temporary file"""
         # Create temporary file
         with tempfile.NamedTemporaryFile(delete=False, suffix=Path(filename).suffix) as temp_file:
             temp_file.write(file_content)
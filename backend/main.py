@@ -1,14 +1,18 @@
-from fastapi import FastAPI, HTTPException, UploadFile, File
+from fastapi import FastAPI, HTTPException, UploadFile, File, Form, Response
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 from fastapi.staticfiles import StaticFiles
 from pydantic import BaseModel
-from typing import List, Dict
+from typing import List, Dict, Optional
+from datetime import datetime, timezone
 import os
 
 from backend.embedder import InstructorEmbedder
 from backend.vector_store import QdrantVectorStore
 from backend.llm import QwenLLM
 from backend.document_processor import DocumentProcessor
+from backend.admission import AdmissionController, AdmissionRejected
 from backend.config import config
 
 # Initialize components
@@ -17,6 +21,22 @@ embedder = InstructorEmbedder()
 vector_store = QdrantVectorStore()
 llm = QwenLLM()
 document_processor = DocumentProcessor()
+admission_controller = AdmissionController(
+    max_concurrent=config.MAX_CONCURRENT_REQUESTS,
+    queue_limits={"ask": config.ASK_QUEUE_SIZE, "upload": config.UPLOAD_QUEUE_SIZE},
+    priorities={"ask": 0, "upload": 1},
+    queue_timeout=config.QUEUE_TIMEOUT_SECONDS,
+    retry_after=config.RETRY_AFTER_SECONDS
+)
+
+@app.exception_handler(AdmissionRejected)
+async def admission_rejected_handler(request, exc: AdmissionRejected):
+    """Turn shed requests into 429/503 responses with Retry-After"""
+    return JSONResponse(
+        status_code=exc.status_code,
+        content={"detail": exc.detail},
+        headers={"Retry-After": str(exc.retry_after)}
+    )
 
 # Configure CORS
 app.add_middleware(
@@ -25,11 +45,38 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["Retry-After", "X-Queue-Wait-Ms"],
 )
 
 # Request/Response models
+class SearchFilters(BaseModel):
+    filenames: Optional[List[str]] = None
+    tags: Optional[List[str]] = None
+    uploaded_after: Optional[datetime] = None
+    uploaded_before: Optional[datetime] = None
+
+    def to_store_filters(self) -> Dict:
+        """Convert to the filters dict understood by the vector store"""
+        return {
+            "filenames": self.filenames,
+            "tags": self.tags,
+            "uploaded_after": self._to_timestamp(self.uploaded_after),
+            "uploaded_before": self._to_timestamp(self.uploaded_before),
+        }
+
+    @staticmethod
+    def _to_timestamp(value: Optional[datetime]) -> Optional[float]:
+        """Unix timestamp, treating naive datetimes as UTC rather than server-local time"""
+        if value is None:
+            return None
+        if value.tzinfo is None:
+            value = value.replace(tzinfo=timezone.utc)
+        return value.timestamp()
+
 class QuestionRequest(BaseModel):
     question: str
+    filters: Optional[SearchFilters] = None
+    collection: Optional[str] = None
 
 class AnswerResponse(BaseModel):
     answer: str
@@ -40,40 +87,69 @@ class UploadResponse(BaseModel):
     filename: str
     chunks_processed: int
 
+def validate_collection(collection: Optional[str]):
+    """Reject collections outside the configured allowlist"""
+    if collection is None or collection == config.QDRANT_COLLECTION_NAME:
+        return
+    if collection not in config.QDRANT_COLLECTIONS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown collection. Allowed collections: {', '.join(config.QDRANT_COLLECTIONS)}"
+        )
+
 @app.post("/api/ask", response_model=AnswerResponse)
-async def ask_question(request: QuestionRequest):
+async def ask_question(request: QuestionRequest, response: Response):
     """Process a user question and return an answer with sources"""
-    try:
-        # Embed the question
-        query_embedding = embedder.embed_query(request.question)
-        
-        # Search for relevant documents
-        relevant_docs = vector_store.search(
-            query_embedding, 
-            top_k=config.TOP_K_RESULTS
-        )
-        
-        if not relevant_docs:
+    validate_collection(request.collection)
+    
+    async with admission_controller.admit("ask") as queue_wait:
+        response.headers["X-Queue-Wait-Ms"] = f"{queue_wait * 1000:.1f}"
+        try:
+            # Embed the question
+            query_embedding = await run_in_threadpool(embedder.embed_query, request.question)
+            
+            # Search for relevant documents
+            relevant_docs = await run_in_threadpool(
+                vector_store.search,
+                query_embedding, 
+                top_k=config.TOP_K_RESULTS,
+                filters=request.filters.to_store_filters() if request.filters else None,
+                collection_name=request.collection
+            )
+            
+            if not relevant_docs:
+                return AnswerResponse(
+                    answer="I couldn't find any relevant information to answer your question.",
+                    sources=[]
+                )
+            
+            # Generate answer using LLM
+            answer = await run_in_threadpool(llm.generate_answer, request.question, relevant_docs)
+            
             return AnswerResponse(
-                answer="I couldn't find any relevant information to answer your question.",
-                sources=[]
+                answer=answer,
+                sources=relevant_docs
             )
         
-        # Generate answer using LLM
-        answer = llm.generate_answer(request.question, relevant_docs)
-        
-        return AnswerResponse(
-            answer=answer,
-            sources=relevant_docs
-        )
-    
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=str(e))
 
 @app.post("/api/upload", response_model=UploadResponse)
-async def upload_document(file: UploadFile = File(...)):
-    """Upload and process a document (PDF, DOCX, or TXT)"""
+async def upload_document(
+    response: Response,
+    file: UploadFile = File(...),
+    tags: Optional[str] = Form(None),
+    collection: Optional[str] = Form(None)
+):
+    """Upload and process a document (PDF, DOCX, or TXT)
+
+    Optional comma-separated tags are stored with each chunk so questions can
+    be filtered by them, and collection routes the document to one of the
+    configured Qdrant collections instead of the default one.
+    """
     try:
+        validate_collection(collection)
+        
         # Validate filename
         if not file.filename:
             raise HTTPException(status_code=400, detail="No filename provided")
@@ -94,18 +170,28 @@ async def upload_document(file: UploadFile = File(...)):
         if len(file_content) == 0:
             raise HTTPException(status_code=400, detail="File is empty")
         
-        # Process the document
-        documents = await document_processor.process_uploaded_file(file_content, file.filename)
-        
-        if not documents:
-            raise HTTPException(status_code=400, detail="No text could be extracted from the file")
-        
-        # Generate embeddings
-        texts = [doc["text"] for doc in documents]
-        embeddings = embedder.embed_documents(texts)
-        
-        # Store in vector database
-        vector_store.add_documents(embeddings, documents)
+        async with admission_controller.admit("upload") as queue_wait:
+            response.headers["X-Queue-Wait-Ms"] = f"{queue_wait * 1000:.1f}"
+            
+            # Process the document
+            documents = await document_processor.process_uploaded_file(file_content, file.filename)
+            
+            if not documents:
+                raise HTTPException(status_code=400, detail="No text could be extracted from the file")
+            
+            # Attach tags for filtered search
+            tag_list = [tag.strip() for tag in tags.split(",") if tag.strip()] if tags else []
+            for doc in documents:
+                doc["tags"] = tag_list
+            
+            # Generate embeddings
+            texts = [doc["text"] for doc in documents]
+            embeddings = await run_in_threadpool(embedder.embed_documents, texts)
+            
+            # Store in vector database
+            await run_in_threadpool(
+                vector_store.add_documents, embeddings, documents, collection_name=collection
+            )
         
         return UploadResponse(
             message="Document uploaded and processed successfully",
@@ -113,7 +199,7 @@ async def upload_document(file: UploadFile = File(...)):
             chunks_processed=len(documents)
         )
         
-    except HTTPException:
+    except (HTTPException, AdmissionRejected):
         raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error processing file: {str(e)}")
@@ -123,6 +209,11 @@ async def health_check():
     """Health check endpoint"""
     return {"status": "healthy"}
 
+@app.get("/api/admission")
+async def admission_status():
+    """Queue depths, rejections and queue wait times for admission control"""
+    return admission_controller.snapshot()
+
 # Serve frontend
 if os.path.exists("frontend"):
     app.mount("/", StaticFiles(directory="frontend", html=True), name="frontend")
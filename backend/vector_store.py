@@ -1,9 +1,26 @@
-from typing import List, Dict, Tuple
+from typing import List, Dict, Tuple, Optional
 import numpy as np
 from qdrant_client import QdrantClient
-from qdrant_client.models import Distance, VectorParams, PointStruct
+from qdrant_client.models import (
+    Distance,
+    VectorParams,
+    PointStruct,
+    PayloadSchemaType,
+    Filter,
+    FieldCondition,
+    MatchAny,
+    Range,
+)
 from backend.config import config
 import uuid
+import time
+
+# Payload fields that can be filtered on, with the index type Qdrant should build
+PAYLOAD_INDEXES = {
+    "filename": PayloadSchemaType.KEYWORD,
+    "tags": PayloadSchemaType.KEYWORD,
+    "uploaded_at": PayloadSchemaType.FLOAT,
+}
 
 class QdrantVectorStore:
     def __init__(self):
@@ -11,25 +28,91 @@ class QdrantVectorStore:
             host=config.QDRANT_HOST,
             port=config.QDRANT_PORT
         )
+        self._known_collections = set()
+        self._indexed_collections = set()
         self._ensure_collection()
-    
-    def _ensure_collection(self):
-        """Create collection if it doesn't exist"""
+
+    def _collection_name(self, collection_name: Optional[str] = None) -> str:
+        """Resolve the target collection, falling back to the default one"""
+        return collection_name or config.QDRANT_COLLECTION_NAME
+
+    def _collection_exists(self, collection_name: str) -> bool:
+        """Check whether a collection exists, caching positive lookups"""
+        if collection_name in self._known_collections:
+            return True
+
         collections = self.client.get_collections().collections
-        collection_names = [c.name for c in collections]
-        
-        if config.QDRANT_COLLECTION_NAME not in collection_names:
+        self._known_collections.update(c.name for c in collections)
+        return collection_name in self._known_collections
+
+    def _ensure_collection(self, collection_name: Optional[str] = None):
+        """Create collection and its payload indexes if they don't exist"""
+        collection_name = self._collection_name(collection_name)
+
+        if not self._collection_exists(collection_name):
             self.client.create_collection(
-                collection_name=config.QDRANT_COLLECTION_NAME,
+                collection_name=collection_name,
                 vectors_config=VectorParams(
                     size=config.EMBEDDING_DIMENSION,
                     distance=Distance.COSINE
                 )
             )
-            print(f"Created collection: {config.QDRANT_COLLECTION_NAME}")
-    
-    def add_documents(self, embeddings: np.ndarray, documents: List[Dict]):
+            self._known_collections.add(collection_name)
+            print(f"Created collection: {collection_name}")
+
+        if collection_name not in self._indexed_collections:
+            self._ensure_payload_indexes(collection_name)
+            self._indexed_collections.add(collection_name)
+
+    def _ensure_payload_indexes(self, collection_name: str):
+        """Index filterable payload fields so filtered searches don't scan every point"""
+        existing = self.client.get_collection(collection_name=collection_name).payload_schema or {}
+
+        for field_name, field_schema in PAYLOAD_INDEXES.items():
+            if field_name not in existing:
+                self.client.create_payload_index(
+                    collection_name=collection_name,
+                    field_name=field_name,
+                    field_schema=field_schema
+                )
+                print(f"Created payload index on '{field_name}' in {collection_name}")
+
+    def _build_filter(self, filters: Optional[Dict]) -> Optional[Filter]:
+        """Translate a filters dict into a Qdrant payload filter"""
+        if not filters:
+            return None
+
+        conditions = []
+
+        if filters.get("filenames"):
+            conditions.append(
+                FieldCondition(key="filename", match=MatchAny(any=list(filters["filenames"])))
+            )
+
+        if filters.get("tags"):
+            conditions.append(
+                FieldCondition(key="tags", match=MatchAny(any=list(filters["tags"])))
+            )
+
+        uploaded_after = filters.get("uploaded_after")
+        uploaded_before = filters.get("uploaded_before")
+        if uploaded_after is not None or uploaded_before is not None:
+            conditions.append(
+                FieldCondition(
+                    key="uploaded_at",
+                    range=Range(gte=uploaded_after, lte=uploaded_before)
+                )
+            )
+
+        return Filter(must=conditions) if conditions else None
+
+    def add_documents(self, embeddings: np.ndarray, documents: List[Dict],
+                      collection_name: Optional[str] = None):
         """Add documents with their embeddings to Qdrant"""
+        collection_name = self._collection_name(collection_name)
+        self._ensure_collection(collection_name)
+
+        uploaded_at = time.time()
         points = []
         for i, (embedding, doc) in enumerate(zip(embeddings, documents)):
             point = PointStruct(
@@ -38,25 +121,35 @@ class QdrantVectorStore:
                 payload={
                     "text": doc["text"],
                     "filename": doc["filename"],
-                    "chunk_id": doc.get("chunk_id", i)
+                    "chunk_id": doc.get("chunk_id", i),
+                    "tags": doc.get("tags", []),
+                    "uploaded_at": doc.get("uploaded_at", uploaded_at)
                 }
             )
             points.append(point)
-        
+
         self.client.upsert(
-            collection_name=config.QDRANT_COLLECTION_NAME,
+            collection_name=collection_name,
             points=points
         )
-        print(f"Added {len(points)} documents to Qdrant")
-    
-    def search(self, query_embedding: np.ndarray, top_k: int = 5) -> List[Dict]:
-        """Search for similar documents"""
+        print(f"Added {len(points)} documents to Qdrant collection {collection_name}")
+
+    def search(self, query_embedding: np.ndarray, top_k: int = 5,
+               filters: Optional[Dict] = None,
+               collection_name: Optional[str] = None) -> List[Dict]:
+        """Search for similar documents, optionally restricted by payload filters"""
+        collection_name = self._collection_name(collection_name)
+
+        if not self._collection_exists(collection_name):
+            return []
+
         results = self.client.search(
-            collection_name=config.QDRANT_COLLECTION_NAME,
+            collection_name=collection_name,
             query_vector=query_embedding.tolist(),
+            query_filter=self._build_filter(filters),
             limit=top_k
         )
-        
+
         return [
             {
                 "text": result.payload["text"],
@@ -65,8 +158,11 @@ class QdrantVectorStore:
             }
             for result in results
         ]
-    
-    def clear_collection(self):
+
+    def clear_collection(self, collection_name: Optional[str] = None):
         """Clear all documents from the collection"""
-        self.client.delete_collection(collection_name=config.QDRANT_COLLECTION_NAME)
-        self._ensure_collection() 
\ No newline at end of file
+        collection_name = self._collection_name(collection_name)
+        self.client.delete_collection(collection_name=collection_name)
+        self._known_collections.discard(collection_name)
+        self._indexed_collections.discard(collection_name)
+        self._ensure_collection(collection_name)
@@ -0,0 +1,84 @@
+import argparse
+import json
+import time
+import urllib.error
+import urllib.request
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List
+
+def send_question(url: str, question: str, timeout: float) -> Dict:
+    """Send one question and record status, latency and queue wait"""
+    body = json.dumps({"question": question}).encode("utf-8")
+    request = urllib.request.Request(url, data=body, headers={"Content-Type": "application/json"})
+    start = time.perf_counter()
+    try:
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            response.read()
+            status = response.status
+            queue_wait = response.headers.get("X-Queue-Wait-Ms")
+            retry_after = None
+    except urllib.error.HTTPError as e:
+        status = e.code
+        queue_wait = None
+        retry_after = e.headers.get("Retry-After")
+    except Exception:
+        status = "error"
+        queue_wait = None
+        retry_after = None
+
+    return {
+        "status": status,
+        "latency": time.perf_counter() - start,
+        "queue_wait_ms": float(queue_wait) if queue_wait else None,
+        "retry_after": retry_after
+    }
+
+def percentile(values: List[float], pct: float) -> float:
+    """Nearest-rank percentile"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(pct / 100 * len(ordered))) - 1))
+    return ordered[index]
+
+def run_load_test(base_url: str, total: int, concurrency: int, timeout: float):
+    """Overload /api/ask and report how admission control sheds the excess"""
+    url = f"{base_url}/api/ask"
+    print(f"Sending {total} questions to {url} with {concurrency} concurrent clients...")
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        results = list(pool.map(
+            lambda i: send_question(url, f"Load test question {i}", timeout),
+            range(total)
+        ))
+    elapsed = time.perf_counter() - start
+
+    statuses = Counter(r["status"] for r in results)
+    ok_latencies = [r["latency"] for r in results if r["status"] == 200]
+    shed_latencies = [r["latency"] for r in results if r["status"] in (429, 503)]
+    queue_waits = [r["queue_wait_ms"] for r in results if r["queue_wait_ms"] is not None]
+
+    print(f"\nCompleted in {elapsed:.1f}s")
+    print(f"Status codes: {dict(statuses)}")
+    print(f"Accepted latency  p50={percentile(ok_latencies, 50):.2f}s  p99={percentile(ok_latencies, 99):.2f}s")
+    print(f"Rejected latency  p50={percentile(shed_latencies, 50):.3f}s  p99={percentile(shed_latencies, 99):.3f}s")
+    print(f"Queue wait        p50={percentile(queue_waits, 50):.0f}ms  p99={percentile(queue_waits, 99):.0f}ms")
+
+    try:
+        with urllib.request.urlopen(f"{base_url}/api/admission", timeout=timeout) as response:
+            print("\nAdmission stats:")
+            print(json.dumps(json.loads(response.read()), indent=2))
+    except Exception as e:
+        print(f"Could not fetch admission stats: {e}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate overload against a running chatbot server")
+    parser.add_argument("--url", default="http://localhost:8000", help="Server base URL")
+    parser.add_argument("--requests", type=int, default=200, help="Total questions to send")
+    parser.add_argument("--concurrency", type=int, default=50, help="Concurrent clients")
+    parser.add_argument("--timeout", type=float, default=300, help="Per-request timeout in seconds")
+    args = parser.parse_args()
+
+    run_load_test(args.url, args.requests, args.concurrency, args.timeout)
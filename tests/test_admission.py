@@ -0,0 +1,136 @@
+import asyncio
+import time
+from collections import Counter
+
+import pytest
+
+from backend.admission import AdmissionController, AdmissionRejected
+
+SERVICE_TIME = {"ask": 0.02, "upload": 0.05}
+
+def make_controller(max_concurrent=1, ask_queue=8, upload_queue=2, queue_timeout=0.5):
+    return AdmissionController(
+        max_concurrent=max_concurrent,
+        queue_limits={"ask": ask_queue, "upload": upload_queue},
+        priorities={"ask": 0, "upload": 1},
+        queue_timeout=queue_timeout,
+        retry_after=5
+    )
+
+async def stub_request(controller, endpoint, results, admitted_order=None, service_time=None):
+    """Hold a slot for a fake model call and record the outcome"""
+    start = time.perf_counter()
+    try:
+        async with controller.admit(endpoint):
+            if admitted_order is not None:
+                admitted_order.append(endpoint)
+            await asyncio.sleep(service_time if service_time is not None else SERVICE_TIME[endpoint])
+    except AdmissionRejected as e:
+        results.append((endpoint, e.status_code, e.retry_after, time.perf_counter() - start))
+    else:
+        results.append((endpoint, 200, None, time.perf_counter() - start))
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * len(ordered))) - 1)]
+
+def test_full_queue_returns_429():
+    async def scenario():
+        controller = make_controller(ask_queue=3)
+        results = []
+        await asyncio.gather(*(stub_request(controller, "ask", results) for _ in range(10)))
+        return results
+
+    statuses = Counter(status for _, status, _, _ in asyncio.run(scenario()))
+    # One running plus three queued are admitted, the rest are shed
+    assert statuses == {200: 4, 429: 6}
+
+def test_queue_timeout_returns_503_with_retry_after():
+    async def scenario():
+        controller = make_controller(queue_timeout=0.05)
+        results = []
+        await asyncio.gather(
+            stub_request(controller, "ask", results, service_time=0.3),
+            stub_request(controller, "ask", results),
+        )
+        return controller, results
+
+    controller, results = asyncio.run(scenario())
+    rejected = [r for r in results if r[1] != 200]
+    assert len(rejected) == 1
+    _, status, retry_after, latency = rejected[0]
+    assert status == 503
+    assert retry_after == 5
+    assert latency < 0.3
+    assert controller.snapshot()["queues"]["ask"]["timed_out"] == 1
+
+def test_asks_are_admitted_ahead_of_uploads():
+    async def scenario():
+        controller = make_controller(upload_queue=4)
+        results = []
+        order = []
+        # Occupy the only slot, then queue uploads before asks
+        blocker = asyncio.create_task(stub_request(controller, "upload", results, order))
+        await asyncio.sleep(0)
+        uploads = [asyncio.create_task(stub_request(controller, "upload", results, order)) for _ in range(3)]
+        await asyncio.sleep(0)
+        asks = [asyncio.create_task(stub_request(controller, "ask", results, order)) for _ in range(3)]
+        await asyncio.gather(blocker, *uploads, *asks)
+        return order
+
+    assert asyncio.run(scenario()) == ["upload", "ask", "ask", "ask", "upload", "upload", "upload"]
+
+def test_cancelled_waiter_does_not_leak_slot():
+    async def scenario():
+        controller = make_controller()
+        results = []
+        running = asyncio.create_task(stub_request(controller, "ask", results, service_time=0.05))
+        await asyncio.sleep(0)
+        waiting = asyncio.create_task(stub_request(controller, "ask", results))
+        await asyncio.sleep(0.01)
+        waiting.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiting
+        await running
+
+        snapshot = controller.snapshot()
+        async with controller.admit("ask") as wait:
+            pass
+        return snapshot, wait
+
+    snapshot, wait = asyncio.run(scenario())
+    assert snapshot["active"] == 0
+    assert snapshot["queues"]["ask"]["queued"] == 0
+    assert wait == 0.0
+
+def test_p99_stays_bounded_under_mixed_overload():
+    queue_timeout = 0.2
+
+    async def scenario():
+        controller = make_controller(max_concurrent=2, ask_queue=8, upload_queue=2,
+                                     queue_timeout=queue_timeout)
+        results = []
+        tasks = []
+        # Bursts of questions and uploads far beyond what the slots can serve
+        for _ in range(10):
+            tasks += [asyncio.create_task(stub_request(controller, "ask", results)) for _ in range(20)]
+            tasks += [asyncio.create_task(stub_request(controller, "upload", results)) for _ in range(5)]
+            await asyncio.sleep(0.01)
+        await asyncio.gather(*tasks)
+        return controller, results
+
+    controller, results = asyncio.run(scenario())
+    statuses = Counter(status for _, status, _, _ in results)
+    assert statuses[200] > 0
+    assert statuses[429] > 0
+
+    accepted = [latency for _, status, _, latency in results if status == 200]
+    slack = 0.05
+    assert percentile(accepted, 99) <= queue_timeout + max(SERVICE_TIME.values()) + slack
+
+    shed = [latency for _, status, _, latency in results if status == 429]
+    assert max(shed) < slack
+
+    snapshot = controller.snapshot()
+    assert snapshot["active"] == 0
+    assert all(queue["queued"] == 0 for queue in snapshot["queues"].values())